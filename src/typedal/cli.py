@@ -2,29 +2,33 @@
 Typer CLI for TypeDAL.
 """
 
+import copy
+import functools
+import os
 import sys
 import typing
 import warnings
 from pathlib import Path
 from typing import Optional
 
-import tomli
 from configuraptor import asdict
 from configuraptor.alias import is_alias
-from configuraptor.helpers import is_optional
+from configuraptor.helpers import find_pyproject_toml, is_optional
+from dotenv import find_dotenv
+from typing_extensions import Never
 
+from . import caching
+from .__about__ import __version__
+from .config import TypeDALConfig, _fill_defaults, load_config, transform
+from .core import TypeDAL
 from .helpers import match_strings
 from .types import AnyDict
 
-try:
-    import edwh_migrate
-    import pydal2sql  # noqa: F401
-    import questionary
-    import rich
-    import tomlkit
-    import typer
-    from tabulate import tabulate
-except ImportError as e:
+
+def _missing_migrations_extra(e: ImportError) -> Never:
+    """
+    Warn about the missing `migrations` extra and stop the program.
+    """
     # ImportWarning is hidden by default
     warnings.warn(
         "`migrations` extra not installed. Please run `pip install typedal[migrations]` to fix this.",
@@ -33,39 +37,110 @@ except ImportError as e:
     )
     exit(127)  # command not found
 
-from pydal2sql.typer_support import IS_DEBUG, with_exit_code
-from pydal2sql.types import (
-    DBType_Option,
-    OptionalArgument,
-    OutputFormat_Option,
-    Tables_Option,
-)
-from pydal2sql_core import core_alter, core_create, core_stub
-from typing_extensions import Never
 
-from . import caching
-from .__about__ import __version__
-from .config import TypeDALConfig, _fill_defaults, load_config, transform
-from .core import TypeDAL
+# heavier dependencies (questionary, rich, tomlkit, edwh_migrate, tabulate)
+# are imported in the commands that use them, so e.g. `--version` stays fast.
+try:
+    import typer
+    from pydal2sql.typer_support import IS_DEBUG, with_exit_code
+    from pydal2sql.types import (
+        DBType_Option,
+        OptionalArgument,
+        OutputFormat_Option,
+        Tables_Option,
+    )
+    from pydal2sql_core import core_alter, core_create, core_stub
+except ImportError as e:
+    _missing_migrations_extra(e)
+
+if typing.TYPE_CHECKING:
+    from edwh_migrate import Config as MigrateConfig
+    from pydal2sql.typer_support import Config as P2SConfig
 
 app = typer.Typer(
     no_args_is_help=True,
 )
 
-questionary_types: dict[typing.Hashable, Optional[AnyDict]] = {
-    str: {
-        "type": "text",
-        "validate": lambda text: True if len(text) > 0 else "Please enter a value",
-    },
-    Optional[str]: {
-        "type": "text",
-        # no validate because it's optional
-    },
-    bool: {
-        "type": "confirm",
-    },
-    int: {"type": "text", "validate": lambda text: True if text.isdigit() else "Please enter a number"},
-    # specific props:
+ConfigKey: typing.TypeAlias = tuple[typing.Any, ...]
+
+
+def _file_key(path: str | Path | None) -> tuple[str, int, int] | None:
+    """
+    Identify the current version of a file by its path, modification time and size.
+    """
+    if not path:
+        return None
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+def _config_key(connection: Optional[str]) -> ConfigKey | None:
+    """
+    Key that changes whenever the result of `load_config(connection)` could change.
+
+    None if there is no pyproject.toml (yet) to base a cache on.
+    """
+    toml_key = _file_key(find_pyproject_toml())
+    if toml_key is None:
+        return None
+
+    return connection, toml_key, _file_key(find_dotenv(usecwd=True)), hash(frozenset(os.environ.items()))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config(key: ConfigKey) -> TypeDALConfig:
+    return load_config(key[0])
+
+
+@functools.lru_cache(maxsize=4)
+def _load_pydal2sql_config(key: ConfigKey) -> "P2SConfig":
+    return _load_config(key).to_pydal2sql()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_migrate_config(key: ConfigKey) -> "MigrateConfig":
+    return _load_config(key).to_migrate()
+
+
+def _cached_load_config(connection: Optional[str] = None) -> TypeDALConfig:
+    """
+    Load the config like `load_config`, but reuse the result as long as pyproject.toml, .env and env vars are unchanged.
+
+    A copy is returned, so callers can safely `.update()` it.
+    """
+    if (key := _config_key(connection)) is None:
+        return load_config(connection)
+
+    return copy.copy(_load_config(key))
+
+
+def _cached_pydal2sql_config(connection: Optional[str] = None) -> "P2SConfig":
+    """
+    Cached (copy of) `load_config(connection).to_pydal2sql()`.
+    """
+    if (key := _config_key(connection)) is None:
+        return load_config(connection).to_pydal2sql()
+
+    return copy.copy(_load_pydal2sql_config(key))
+
+
+def _cached_migrate_config(connection: Optional[str] = None) -> "MigrateConfig":
+    """
+    Cached (copy of) `load_config(connection).to_migrate()`.
+    """
+    if (key := _config_key(connection)) is None:
+        return load_config(connection).to_migrate()
+
+    return copy.copy(_load_migrate_config(key))
+
+
+# questions by config property (takes priority over _QUESTIONS_BY_TYPE):
+_QUESTIONS_BY_PROP: dict[str, Optional[AnyDict]] = {
     "dialect": {
         "type": "select",
         "choices": ["sqlite", "postgres", "mysql"],
@@ -94,21 +169,49 @@ questionary_types: dict[typing.Hashable, Optional[AnyDict]] = {
     "fake_migrate": None,  # only enable via config if required
 }
 
+
+def _validate_nonempty(text: str) -> bool | str:
+    return True if text else "Please enter a value"
+
+
+def _validate_digit(text: str) -> bool | str:
+    return True if text.isdigit() else "Please enter a number"
+
+
+# default questions by config annotation:
+_QUESTIONS_BY_TYPE: dict[typing.Any, AnyDict] = {
+    str: {
+        "type": "text",
+        "validate": _validate_nonempty,
+    },
+    Optional[str]: {
+        "type": "text",
+        # no validate because it's optional
+    },
+    bool: {
+        "type": "confirm",
+    },
+    int: {"type": "text", "validate": _validate_digit},
+}
+
+# TypeDALConfig's properties don't change at runtime, so introspect them only once:
+_TYPEDAL_ANNOTATIONS = tuple(TypeDALConfig.__annotations__.items())
+_TYPEDAL_ALIASES = frozenset(prop for prop, _ in _TYPEDAL_ANNOTATIONS if is_alias(TypeDALConfig, prop))
+_TYPEDAL_OPTIONAL = frozenset(prop for prop, annotation in _TYPEDAL_ANNOTATIONS if is_optional(annotation))
+
 T = typing.TypeVar("T")
 
 notfound = object()
 
 
 def _get_question(prop: str, annotation: typing.Type[T]) -> Optional[AnyDict]:  # pragma: no cover
-    question = questionary_types.get(prop, notfound)
+    question = _QUESTIONS_BY_PROP.get(prop, notfound)
     if question is notfound:
         # None means skip the question, notfound means use the type default!
-        question = questionary_types.get(annotation)  # type: ignore
+        question = _QUESTIONS_BY_TYPE.get(annotation)
 
-    if not question:
-        return None
-    # make a copy so the original is not overwritten:
-    return question.copy()  # type: ignore
+    # the shared template is returned as-is, callers must not modify it!
+    return question or None  # type: ignore
 
 
 def get_question(prop: str, annotation: typing.Type[T], default: T | None) -> Optional[T]:  # pragma: no cover
@@ -118,15 +221,17 @@ def get_question(prop: str, annotation: typing.Type[T], default: T | None) -> Op
     if not (question := _get_question(prop, annotation)):
         return default
 
-    question["name"] = prop
-    question["message"] = question.get("message", f"{prop}? ")
-    default = typing.cast(T, default or question.get("default") or "")
+    import questionary
+
+    # build a new dict so the template is not overwritten:
+    question = {**question, "name": prop, "message": question.get("message", f"{prop}? ")}
+    prompt_default: typing.Any = default or question.get("default") or ""
 
     if annotation is int:
-        default = typing.cast(T, str(default))
+        prompt_default = str(prompt_default)
 
-    response = questionary.unsafe_prompt([question], default=default)[prop]
-    return typing.cast(T, response)
+    response: T = questionary.unsafe_prompt([question], default=prompt_default)[prop]
+    return response
 
 
 @app.command()
@@ -141,53 +246,68 @@ def setup(
     # 1. check if [tool.typedal] in pyproject.toml and ask missing questions (excl .env vars)
     # 2. else if [tool.migrate] and/or [tool.pydal2sql] exist in the config, ask the user with copied defaults
     # 3. else: ask the user every question or minimal questions based on cli arg
+    try:
+        import rich
+        import tomlkit
+    except ImportError as e:
+        _missing_migrations_extra(e)
 
-    config = load_config(config_file)
+    config = _cached_load_config(config_file)
 
     toml_path = Path(config.pyproject)
 
-    if not (config.pyproject and toml_path.exists()):
+    try:
+        # just try to read instead of checking `.exists()` first:
+        toml_contents = toml_path.read_text() if config.pyproject else None
+    except FileNotFoundError:
+        toml_contents = None
+
+    if toml_contents is None:
         # no pyproject.toml found!
         toml_path = toml_path if config.pyproject else Path("pyproject.toml")
         rich.print(f"[blue]Config toml doesn't exist yet, creating {toml_path}[/blue]", file=sys.stderr)
         toml_path.touch()
+        toml_contents = ""
+
+    # tomlkit preserves comments, so the same document can be written back later:
+    toml_obj: AnyDict = tomlkit.parse(toml_contents)
 
-    toml_contents = toml_path.read_text()
-    # tomli has native Python types, tomlkit doesn't but preserves comments
-    toml_obj: AnyDict = tomli.loads(toml_contents)
+    tool = toml_obj.get("tool", {})
 
-    if "[tool.pydal2sql]" in toml_contents:
+    if "pydal2sql" in tool:
         mapping = {"": ""}  # <- placeholder
 
-        extra_config = toml_obj["tool"]["pydal2sql"]
+        extra_config = tool["pydal2sql"].unwrap()
         extra_config = {mapping.get(k, k): v for k, v in extra_config.items()}
         extra_config.pop("format", None)  # always edwh-migrate
         config.update(**extra_config)
 
-    if "[tool.migrate]" in toml_contents:
+    if "migrate" in tool:
         mapping = {"migrate_uri": "database"}
 
-        extra_config = toml_obj["tool"]["migrate"]
+        extra_config = tool["migrate"].unwrap()
         extra_config = {mapping.get(k, k): v for k, v in extra_config.items()}
 
         config.update(**extra_config)
 
-    if "[tool.typedal]" in toml_contents:
-        section = toml_obj["tool"]["typedal"]
+    if "typedal" in tool:
+        section = tool["typedal"].unwrap()
         config.update(**section, _overwrite=True)
 
-    data = asdict(config, with_top_level_key=False)
+    # plain (shallow) dict of the current values, so the loop below doesn't need `getattr(config, ...)`:
+    current = {prop: getattr(config, prop, None) for prop, _ in _TYPEDAL_ANNOTATIONS}
+    data = current.copy()
     data["migrate"] = None  # determined based on existence of input/output file.
 
-    for prop, annotation in TypeDALConfig.__annotations__.items():
-        if is_alias(config.__class__, prop):
+    for prop, annotation in _TYPEDAL_ANNOTATIONS:
+        if prop in _TYPEDAL_ALIASES:
             # don't store aliases!
             data.pop(prop, None)
             continue
 
-        if minimal and getattr(config, prop, None) not in (None, "") or is_optional(annotation):
+        if minimal and current.get(prop) not in (None, "") or prop in _TYPEDAL_OPTIONAL:
             # property already present or not required, SKIP!
-            data[prop] = getattr(config, prop, None)
+            data[prop] = current.get(prop)
             continue
 
         _fill_defaults(data, prop, data.get(prop))
@@ -205,23 +325,27 @@ def setup(
         config.update(**{prop: answer})
         data[prop] = answer
 
-    for prop in TypeDALConfig.__annotations__:
-        transform(data, prop)
-
-    with toml_path.open("r") as f:
-        old_contents: AnyDict = tomlkit.load(f)
-
-    if "tool" not in old_contents:
-        old_contents["tool"] = {}
-
     data.pop("pyproject", None)
     data.pop("connection", None)
 
-    # ignore any None:
-    old_contents["tool"]["typedal"] = {k: v for k, v in data.items() if v is not None}
+    # transform and filter in one go:
+    final: AnyDict = {}
+    for prop in list(data):
+        transform(data, prop)
+        # ignore any None:
+        if (value := data[prop]) is not None:
+            final[prop] = value
+
+    if "tool" not in toml_obj:
+        toml_obj["tool"] = {}
+
+    toml_obj["tool"]["typedal"] = final
 
-    with toml_path.open("w") as f:
-        tomlkit.dump(old_contents, f)
+    # write to a temporary file first, so a crash halfway doesn't destroy the existing pyproject.toml:
+    tmp_path = toml_path.with_suffix(toml_path.suffix + ".tmp")
+    with tmp_path.open("w") as f:
+        tomlkit.dump(toml_obj, f)
+    os.replace(tmp_path, toml_path)
 
     rich.print(f"[green]Wrote updated config to {toml_path}![/green]")
 
@@ -246,8 +370,7 @@ def generate_migrations(
     """
     # 1. choose CREATE or ALTER based on whether 'output' exists?
     # 2. pass right args based on 'config' to function chosen in 1.
-    generic_config = load_config(connection)
-    pydal2sql_config = generic_config.to_pydal2sql()
+    pydal2sql_config = _cached_pydal2sql_config(connection)
     pydal2sql_config.update(
         magic=magic,
         noop=noop,
@@ -260,10 +383,12 @@ def generate_migrations(
         _skip_none=True,
     )
 
-    if pydal2sql_config.output and Path(pydal2sql_config.output).exists():
+    output = pydal2sql_config.output
+    output_exists = bool(output and os.path.exists(output))
+
+    if output_exists:
         if dry_run:
             print("Would run `pyda2sql alter` with config", asdict(pydal2sql_config), file=sys.stderr)
-            sys.stderr.flush()
 
             return True
         else:  # pragma: no cover
@@ -281,7 +406,6 @@ def generate_migrations(
     else:
         if dry_run:
             print("Would run `pyda2sql create` with config", asdict(pydal2sql_config), file=sys.stderr)
-            sys.stderr.flush()
 
             return True
         else:  # pragma: no cover
@@ -320,8 +444,12 @@ def run_migrations(
     # 1. build migrate Config from TypeDAL config
     # 2. import right file
     # 3. `activate_migrations`
-    generic_config = load_config(connection)
-    migrate_config = generic_config.to_migrate()
+    try:
+        import edwh_migrate
+    except ImportError as e:
+        _missing_migrations_extra(e)
+
+    migrate_config = _cached_migrate_config(connection)
 
     migrate_config.update(
         migrate_uri=db_uri,
@@ -362,12 +490,17 @@ def fake_migrations(
 
     glob is supported in 'names'
     """
+    try:
+        import edwh_migrate
+        import rich
+    except ImportError as e:
+        _missing_migrations_extra(e)
+
     if not (names or all):
         rich.print("Please provide one or more migration names, or pass --all to fake all.")
         return 1
 
-    generic_config = load_config(connection)
-    migrate_config = generic_config.to_migrate()
+    migrate_config = _cached_migrate_config(connection)
 
     migrate_config.update(
         migrate_uri=db_uri,
@@ -431,8 +564,7 @@ def migrations_stub(
     """
     Create an empty migration via pydal2sql.
     """
-    generic_config = load_config(connection)
-    pydal2sql_config = generic_config.to_pydal2sql()
+    pydal2sql_config = _cached_pydal2sql_config(connection)
     pydal2sql_config.update(
         format=output_format,
         output=output_file,
@@ -456,6 +588,8 @@ def tabulate_data(data: AnyNestedDict) -> None:
     """
     Print a nested dict of data in a nice, human-readable table.
     """
+    from tabulate import tabulate
+
     flattened_data = []
     for key, inner_dict in data.items():
         temp_dict = {"": key}
@@ -522,7 +656,7 @@ def cache_stats(
         typedal cache.stats user
         typedal cache.stats user.3
     """
-    config = load_config(connection)
+    config = _cached_load_config(connection)
     db = TypeDAL(config=config, migrate=False, fake_migrate=False)
 
     output = get_output_format(typing.cast(FormatOptions, fmt))
@@ -564,7 +698,7 @@ def cache_clear(
         connection (optional): [tool.typedal.<connection>]
         purge (default: no): remove all items, not only expired
     """
-    config = load_config(connection)
+    config = _cached_load_config(connection)
     db = TypeDAL(config=config, migrate=False, fake_migrate=False)
 
     if purge:
@@ -590,7 +724,7 @@ def config_callback() -> Never:
     """
     --show-config requested.
     """
-    config = load_config()
+    config = _cached_load_config()
 
     print(repr(config))
 
@@ -10,11 +10,15 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Any, Optional
 
-import tomli
 from configuraptor import TypedConfig, alias
 from configuraptor.helpers import find_pyproject_toml
 from dotenv import dotenv_values, find_dotenv
 
+try:
+    import tomllib as tomli  # stdlib since 3.11
+except ImportError:
+    import tomli  # type: ignore[no-redef]
+
 from .types import AnyDict
 
 if typing.TYPE_CHECKING:
@@ -73,9 +77,9 @@ class TypeDALConfig(TypedConfig):
         from pydal2sql.typer_support import Config, get_pydal2sql_config
 
         if self.pyproject:  # pragma: no cover
-            project = Path(self.pyproject).read_text()
+            tool = _load_tool_sections(self.pyproject)
 
-            if "[tool.typedal]" not in project and "[tool.pydal2sql]" in project:
+            if "typedal" not in tool and "pydal2sql" in tool:
                 # no typedal config, but existing p2s config:
                 return get_pydal2sql_config(self.pyproject)
 
@@ -99,9 +103,9 @@ class TypeDALConfig(TypedConfig):
         from edwh_migrate import Config, get_config
 
         if self.pyproject:  # pragma: no cover
-            project = Path(self.pyproject).read_text()
+            tool = _load_tool_sections(self.pyproject)
 
-            if "[tool.typedal]" not in project and "[tool.migrate]" in project:
+            if "typedal" not in tool and "migrate" in tool:
                 # no typedal config, but existing p2s config:
                 return get_config()
 
@@ -122,6 +126,14 @@ class TypeDALConfig(TypedConfig):
         )
 
 
+def _load_tool_sections(pyproject: str | Path) -> AnyDict:  # pragma: no cover
+    """
+    Load the [tool] table of a pyproject.toml, to check which tools are configured.
+    """
+    with open(pyproject, "rb") as f:
+        return typing.cast(AnyDict, tomli.load(f).get("tool", {}))
+
+
 def _load_toml(path: str | bool | Path | None = True) -> tuple[str, AnyDict]:
     """
     Path can be a file, a directory, a bool or None.
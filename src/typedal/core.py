@@ -34,6 +34,8 @@ from .helpers import (
     as_lambda,
     extract_type_optional,
     filter_out,
+    get_args,
+    get_origin,
     instanciate,
     is_union,
     looks_like,
@@ -83,6 +85,9 @@ BASIC_MAPPINGS: dict[T_annotation, str] = {
     dt.datetime: "datetime",
 }
 
+# identity-keyed view of BASIC_MAPPINGS, so the common case (str, int, ...) is a single dict hit:
+_BASIC_MAPPINGS_BY_ID: dict[int, str] = {id(k): v for k, v in BASIC_MAPPINGS.items()}
+
 
 def is_typed_field(cls: Any) -> typing.TypeGuard["TypedField[Any]"]:
     """
@@ -90,11 +95,7 @@ def is_typed_field(cls: Any) -> typing.TypeGuard["TypedField[Any]"]:
 
     Deprecated
     """
-    return (
-        isinstance(cls, TypedField)
-        or isinstance(typing.get_origin(cls), type)
-        and issubclass(typing.get_origin(cls), TypedField)
-    )
+    return isinstance(cls, TypedField) or isinstance(get_origin(cls), type) and issubclass(get_origin(cls), TypedField)
 
 
 JOIN_OPTIONS = typing.Literal["left", "inner", None]
@@ -127,6 +128,8 @@ class Relationship(typing.Generic[To_Type]):
     Define a relationship to another table.
     """
 
+    __slots__ = ("_repr", "_type", "condition", "condition_and", "join", "multiple", "on", "table")
+
     _type: To_Type
     table: Type["TypedTable"] | type | str
     condition: Condition
@@ -155,8 +158,9 @@ class Relationship(typing.Generic[To_Type]):
         self.join = "left" if on else join  # .on is always left join!
         self.on = on
         self.condition_and = condition_and
+        self._repr: Optional[str] = None
 
-        if args := typing.get_args(_type):
+        if args := get_args(_type):
             self.table = unwrap_type(args[0])
             self.multiple = True
         else:
@@ -181,7 +185,12 @@ class Relationship(typing.Generic[To_Type]):
     def __repr__(self) -> str:
         """
         Representation of the relationship.
+
+        Since the source code of the callbacks has to be looked up, the result is cached.
         """
+        if self._repr is not None:
+            return self._repr
+
         if callback := self.condition or self.on:
             src_code = inspect.getsource(callback).strip()
 
@@ -193,7 +202,8 @@ class Relationship(typing.Generic[To_Type]):
             src_code = f"to {cls_name} (missing condition)"
 
         join = f":{self.join}" if self.join else ""
-        return f"<Relationship{join} {src_code}>"
+        self._repr = f"<Relationship{join} {src_code}>"
+        return self._repr
 
     def get_table(self, db: "TypeDAL") -> Type["TypedTable"]:
         """
@@ -291,7 +301,7 @@ T_Field: typing.TypeAlias = typing.Union["TypedField[Any]", "Table", Type["Typed
 
 
 def _generate_relationship_condition(_: Type["TypedTable"], key: str, field: T_Field) -> Condition:
-    origin = typing.get_origin(field)
+    origin = get_origin(field)
     # else: generic
 
     if origin is list:
@@ -327,7 +337,7 @@ def to_relationship(
     """
     if looks_like(field, TypedField):
         # typing.get_args works for list[str] but not for TypedField[role] :(
-        if args := typing.get_args(field):
+        if args := get_args(field):
             # TypedField[SomeType] -> SomeType
             field = args[0]
         elif hasattr(field, "_type"):
@@ -350,7 +360,7 @@ def to_relationship(
         warnings.warn(f"Invalid relationship for {cls.__name__}.{key}: {field}")
         return None
 
-    join = "left" if optional or typing.get_origin(field) is list else "inner"
+    join = "left" if optional or get_origin(field) is list else "inner"
 
     return Relationship(typing.cast(type[TypedTable], field), condition, typing.cast(JOIN_OPTIONS, join))
 
@@ -517,13 +527,25 @@ class TypeDAL(pydal.DAL):  # type: ignore
         # remove internal stuff:
         annotations = {k: v for k, v in annotations.items() if not k.startswith("_")}
 
-        typedfields: dict[str, TypedField[Any]] = {
-            k: instanciate(v, True) for k, v in annotations.items() if is_typed_field(v)
-        }
+        typedfields: dict[str, TypedField[Any]] = {}
+        relationships: dict[str, type[Relationship[Any]]] = {}
+        fields: dict[str, Field] = {}
+        # keys of implicit references (also relationships):
+        reference_field_keys: list[str] = []
+
+        # single pass over the annotations to sort out typed fields, relationships, fields and references:
+        for fname, ftype in list(annotations.items()):
+            if looks_like(ftype, Relationship):
+                relationships[fname] = annotations.pop(fname)
+                continue
 
-        relationships: dict[str, type[Relationship[Any]]] = filter_out(annotations, Relationship)
+            if is_typed_field(ftype):
+                typedfields[fname] = instanciate(ftype, True)
 
-        fields = {fname: self._to_field(fname, ftype) for fname, ftype in annotations.items()}
+            field = fields[fname] = self._to_field(fname, ftype)
+            field_type = str(field.type)
+            if field_type.startswith("reference") or field_type.startswith("list:reference"):
+                reference_field_keys.append(fname)
 
         # ! dont' use full_dict here:
         other_kwargs = kwargs | {
@@ -552,11 +574,6 @@ class TypeDAL(pydal.DAL):  # type: ignore
         #     k: v if isinstance(v, Relationship) else to_relationship(cls, k, v) for k, v in relationships.items()
         # }
 
-        # keys of implicit references (also relationships):
-        reference_field_keys = [
-            k for k, v in fields.items() if str(v.type).split(" ")[0] in ("list:reference", "reference")
-        ]
-
         # add implicit relationships:
         # User; list[User]; TypedField[User]; TypedField[list[User]]; TypedField(User); TypedField(list[User])
         relationships |= {
@@ -713,6 +730,10 @@ class TypeDAL(pydal.DAL):  # type: ignore
         # ftype can be a union or type. typing.cast is sometimes used to tell mypy when it's not a union.
         ftype = typing.cast(type, _ftype)  # cast from Type to type to make mypy happy)
 
+        if mapping := _BASIC_MAPPINGS_BY_ID.get(id(ftype)):
+            # basic types (fast path)
+            return mapping
+
         if isinstance(ftype, str):
             # extract type from string
             fw_ref: typing.ForwardRef = typing.get_args(Type[ftype])[0]
@@ -724,7 +745,7 @@ class TypeDAL(pydal.DAL):  # type: ignore
         elif isinstance(ftype, _Table):
             # db.table
             return f"reference {ftype._tablename}"
-        elif issubclass(type(ftype), type) and issubclass(ftype, TypedTable):
+        elif isinstance(ftype, type) and issubclass(ftype, TypedTable):
             # SomeTable
             snakename = cls.to_snake(ftype.__name__)
             return f"reference {snakename}"
@@ -733,10 +754,10 @@ class TypeDAL(pydal.DAL):  # type: ignore
             return ftype._to_field(mut_kw)
         elif origin_is_subclass(ftype, TypedField):
             # TypedField[int]
-            return cls._annotation_to_pydal_fieldtype(typing.get_args(ftype)[0], mut_kw)
-        elif isinstance(ftype, types.GenericAlias) and typing.get_origin(ftype) in (list, TypedField):
+            return cls._annotation_to_pydal_fieldtype(get_args(ftype)[0], mut_kw)
+        elif isinstance(ftype, types.GenericAlias) and get_origin(ftype) in (list, TypedField):
             # list[str] -> str -> string -> list:string
-            _child_type = typing.get_args(ftype)[0]
+            _child_type = get_args(ftype)[0]
             _child_type = cls._annotation_to_pydal_fieldtype(_child_type, mut_kw)
             return f"list:{_child_type}"
         elif is_union(ftype):
@@ -795,6 +816,34 @@ class TypeDAL(pydal.DAL):  # type: ignore
         return to_snake(camel)
 
 
+class _CachedColumn:
+    """
+    Stores a pydal Field on a table class after the first `MyTable.col` lookup via TableMeta.__getattr__.
+
+    Next lookups are resolved by the regular attribute machinery instead of __getattr__.
+    Instance access (e.g. a column that was not selected) and access via another table (a subclass or a redefined class)
+    raise AttributeError, so they fall back to the original __getattr__ logic.
+    """
+
+    __slots__ = ("field", "table")
+
+    def __init__(self, table: Table, field: Field) -> None:
+        """
+        Remember for which table the field was resolved.
+        """
+        self.table = table
+        self.field = field
+
+    def __get__(self, instance: Any, owner: "TableMeta") -> Field:
+        """
+        Only return the cached field when accessed on the class it belongs to.
+        """
+        if instance is None and owner._table is self.table:
+            return self.field
+
+        raise AttributeError(self.field.name)
+
+
 class TableMeta(type):
     """
     This metaclass contains functionality on table classes, that doesn't exist on its instances.
@@ -842,10 +891,15 @@ class TableMeta(type):
             SomeTypedTable.col -> db.table.col (via TypedTableMeta.__getattr__)
 
         """
-        if self._table:
-            return getattr(self._table, col, None)
+        if not self._table:
+            return None
 
-        return None
+        field = getattr(self._table, col, None)
+        if isinstance(field, _Field):
+            # next time, `SomeTypedTable.col` won't reach __getattr__:
+            type.__setattr__(self, col, _CachedColumn(self._table, field))
+
+        return field
 
     def _ensure_table_defined(self) -> Table:
         if not self._table:
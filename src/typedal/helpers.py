@@ -4,6 +4,7 @@ Helpers that work independently of core.
 
 import datetime as dt
 import fnmatch
+import functools
 import io
 import types
 import typing
@@ -91,6 +92,38 @@ def instanciate(cls: typing.Type[T] | T, with_args: bool = False) -> T:
     return cls
 
 
+# id(annotation) -> (annotation, origin, args); the annotation itself is stored to detect reused ids.
+_TYPING_CACHE: dict[int, tuple[Any, Any, tuple[Any, ...]]] = {}
+
+
+def _origin_and_args(annotation: Any) -> tuple[Any, Any, tuple[Any, ...]]:
+    key = id(annotation)
+    cached = _TYPING_CACHE.get(key)
+    if cached is None or cached[0] is not annotation:
+        if len(_TYPING_CACHE) >= 4096:  # pragma: no cover
+            # keep the cache bounded, since it holds references to the annotations
+            _TYPING_CACHE.clear()
+        cached = _TYPING_CACHE[key] = (annotation, typing.get_origin(annotation), typing.get_args(annotation))
+    return cached
+
+
+def get_origin(annotation: Any) -> Any:
+    """
+    Cached version of typing.get_origin.
+
+    Annotations are (mostly) created once and live as long as their class, \
+    while their origin is requested many times during define.
+    """
+    return _origin_and_args(annotation)[1]
+
+
+def get_args(annotation: Any) -> tuple[Any, ...]:
+    """
+    Cached version of typing.get_args.
+    """
+    return _origin_and_args(annotation)[2]
+
+
 def origin_is_subclass(obj: Any, _type: type) -> bool:
     """
     Check if the origin of a generic is a subclass of _type.
@@ -98,11 +131,8 @@ def origin_is_subclass(obj: Any, _type: type) -> bool:
     Example:
         origin_is_subclass(list[str], list) -> True
     """
-    return bool(
-        typing.get_origin(obj)
-        and isinstance(typing.get_origin(obj), type)
-        and issubclass(typing.get_origin(obj), _type)
-    )
+    origin = get_origin(obj)
+    return isinstance(origin, type) and issubclass(origin, _type)
 
 
 def mktable(
@@ -218,10 +248,13 @@ def extract_type_optional(annotation: T | None) -> tuple[T | None, bool]:
     return annotation, False
 
 
+@functools.lru_cache(maxsize=4096)
 def to_snake(camel: str) -> str:
     """
     Convert CamelCase to snake_case.
 
+    The result is cached, since the same class and field names are converted over and over during define.
+
     See Also:
         https://stackoverflow.com/a/44969381
     """
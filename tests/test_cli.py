@@ -91,3 +91,17 @@ def test_get_output_format(capsys):
     captured = capsys.readouterr()
     assert captured.out
     assert not captured.err
+
+
+def test_cached_load_config():
+    from src.typedal.cli import _cached_load_config
+
+    first = _cached_load_config()
+    second = _cached_load_config()
+
+    # equal, but a copy so updating one doesn't affect the cache:
+    assert first is not second
+    assert repr(first) == repr(second)
+
+    first.update(database="sqlite://changed")
+    assert _cached_load_config().database != "sqlite://changed"
@@ -11,8 +11,10 @@ from src.typedal.helpers import (
     all_annotations,
     as_lambda,
     extract_type_optional,
+    get_args,
     get_db,
     get_field,
+    get_origin,
     get_table,
     instanciate,
     is_union,
@@ -72,6 +74,18 @@ def test_origin_is_subclass():
     assert not origin_is_subclass(MyList, dict)
 
 
+def test_cached_get_origin_and_args():
+    alias = list[str]
+    assert get_origin(alias) is list
+    assert get_args(alias) == (str,)
+    # cached result:
+    assert get_args(alias) is get_args(alias)
+
+    assert get_origin(int | None) is typing.get_origin(int | None)
+    assert get_origin(str) is None
+    assert get_args(str) == ()
+
+
 def test_mktable():
     data = {
         "1": {"id": 1, "name": "Alice", "Age": 25, "Occupation": "Software Engineer"},
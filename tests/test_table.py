@@ -255,3 +255,29 @@ def test_table_with_methods():
 
     loaded = json.loads(dumped)
     assert loaded[0]["age"] == 20
+
+
+def test_cached_columns():
+    @db.define()
+    class CachedColumns(TypedTable):
+        name: str
+        age: int
+
+    assert CachedColumns.name is CachedColumns.name is db.cached_columns.name
+    assert "name" in CachedColumns.__dict__
+
+    CachedColumns.insert(name="Cached", age=1)
+
+    # a column that is not selected should still not be available on the instance:
+    row = CachedColumns.select(CachedColumns.id, CachedColumns.age).first()
+    assert row.age == 1
+    with pytest.raises(AttributeError):
+        _ = row.name
+
+    # subclasses use their own table:
+    @db.define()
+    class CachedColumnsChild(CachedColumns):
+        extra: str
+
+    assert CachedColumnsChild.name is db.cached_columns_child.name
+    assert CachedColumns.name is db.cached_columns.name